@@ -1,23 +1,127 @@
 import requests
 import json
+import orjson
 import logging
 import os
 import sys
 import argparse
-from datetime import datetime
-from typing import List, Dict, Any, Optional
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, fields
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Optional, Iterator
 from pathlib import Path
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+_CITY_CONFIG_PATH = Path(__file__).parent / "city_scraper.json"
+_RESULTS_DIR = Path(__file__).parent / "results"
+
+# Parsed contents of city_scraper.json, loaded lazily by LegistarScraper._all_configs
+_CONFIG_CACHE: Optional[Dict[str, Dict[str, Any]]] = None
+
+# Seconds to wait on connect/read before giving up on a request
+REQUEST_TIMEOUT = 30
+
+# Largest $top the Legistar API honours in a single request
+MAX_PAGE_SIZE = 1000
+
+# Worker threads used to fetch pages of a large scrape concurrently
+MAX_PAGE_WORKERS = 4
+
+# Upper bound on cities scraped concurrently; kept below the adapter pool size
+MAX_CONCURRENT_CITIES = 8
+
+# Shared HTTP session so keep-alive connections are reused across scraper instances
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=32,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+))
+# Set a user agent to be polite. Accept-Encoding is left to requests, which
+# advertises br alongside gzip/deflate whenever the brotli package is installed.
+_SESSION.headers.update({
+    'User-Agent': 'civic-stream/1.0 (https://github.com/your-org/civic-stream)',
+    'Accept': 'application/json'
+})
+
+def _utcnow_iso() -> str:
+    """Current UTC time as an ISO 8601 string, to the second"""
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+@dataclass
+class Matter:
+    """Cleaned matter information extracted from a Legistar matter record"""
+    __slots__ = (
+        'id', 'file_number', 'name', 'title', 'type', 'status',
+        'intro_date', 'agenda_date', 'passed_date', 'enactment_date',
+        'enactment_number', 'requester', 'notes', 'version',
+        'text1', 'text2', 'text3', 'text4', 'text5',
+        'date_scraped', 'source_url',
+    )
+    
+    id: Optional[int]
+    file_number: Optional[str]
+    name: Optional[str]
+    title: Optional[str]
+    type: Optional[str]
+    status: Optional[str]
+    intro_date: Optional[str]
+    agenda_date: Optional[str]
+    passed_date: Optional[str]
+    enactment_date: Optional[str]
+    enactment_number: Optional[str]
+    requester: Optional[str]
+    notes: Optional[str]
+    version: Optional[str]
+    text1: Optional[str]
+    text2: Optional[str]
+    text3: Optional[str]
+    text4: Optional[str]
+    text5: Optional[str]
+    date_scraped: str
+    source_url: Optional[str]
+
 class LegistarScraper:
     """Scraper for Legistar API (works with any city)"""
     
+    # Legistar field copied into each Matter field
+    _FIELD_MAP = {
+        'id': 'MatterId',
+        'file_number': 'MatterFile',
+        'name': 'MatterName',
+        'title': 'MatterTitle',
+        'type': 'MatterTypeName',
+        'status': 'MatterStatusName',
+        'intro_date': 'MatterIntroDate',
+        'agenda_date': 'MatterAgendaDate',
+        'passed_date': 'MatterPassedDate',
+        'enactment_date': 'MatterEnactmentDate',
+        'enactment_number': 'MatterEnactmentNumber',
+        'requester': 'MatterRequester',
+        'notes': 'MatterNotes',
+        'version': 'MatterVersion',
+        'text1': 'MatterText1',
+        'text2': 'MatterText2',
+        'text3': 'MatterText3',
+        'text4': 'MatterText4',
+        'text5': 'MatterText5',
+    }
+    # Source fields in Matter declaration order, since extract_matter_info fills
+    # Matter positionally; date_scraped and source_url are computed, not copied
+    _FIELD_SOURCES = tuple(map(_FIELD_MAP.__getitem__, [f.name for f in fields(Matter)[:-2]]))
+    # Ask the OData endpoint to return only the fields we keep
+    _SELECT_FIELDS = ','.join(_FIELD_SOURCES)
+    
     def __init__(self, city: str, api_token: Optional[str] = None):
         self.city = city
         self.base_url = f"https://webapi.legistar.com/v1/{city}"
+        self._matter_url_prefix = f"{self.base_url}/matters/"
         
         # Load city configuration
         self.city_config = self._load_city_config(city)
@@ -38,37 +142,73 @@ class LegistarScraper:
         else:
             logger.info(f"No API token available for {city} - using public access")
         
-        self.session = requests.Session()
-        # Set a user agent to be polite
-        self.session.headers.update({
-            'User-Agent': 'civic-stream/1.0 (https://github.com/your-org/civic-stream)'
-        })
+        self.session = _SESSION
+        # The session is shared across cities, so the token rides on per-request params
+        self._auth_params = {'token': self.api_token} if self.api_token else {}
     
-    def _load_city_config(self, city: str) -> Dict[str, Any]:
-        """Load city configuration from city_scraper.json file"""
-        keys_file = Path(__file__).parent / "city_scraper.json"
-        logger.debug(f"Looking for city config file at: {keys_file}")
+    @classmethod
+    def for_city(cls, city: str, api_token: Optional[str] = None) -> 'LegistarScraper':
+        """
+        Return a shared scraper for a city, constructing it on first use
         
+        Repeat runs (e.g. from a scheduler) skip config lookup and token
+        resolution. Token changes in the environment are not picked up
+        for a city that has already been constructed.
+        
+        Args:
+            city: City code for Legistar API
+            api_token: Explicit API token (optional)
+            
+        Returns:
+            Cached LegistarScraper instance
+        """
+        # Normalize to positional arguments so every call form shares one cache entry
+        return cls._cached_for_city(city, api_token)
+    
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def _cached_for_city(cls, city: str, api_token: Optional[str]) -> 'LegistarScraper':
+        """Memoized constructor behind for_city, keyed on (city, api_token)"""
+        return cls(city, api_token)
+    
+    @classmethod
+    def _all_configs(cls) -> Dict[str, Dict[str, Any]]:
+        """Load every city configuration from city_scraper.json, reading the file only once"""
+        global _CONFIG_CACHE
+        if _CONFIG_CACHE is not None:
+            return _CONFIG_CACHE
+        
+        keys_file = _CITY_CONFIG_PATH
+        logger.debug("Looking for city config file at: %s", keys_file)
+        
+        city_configs = {}
         try:
             if keys_file.exists():
-                logger.debug(f"Found city config file: {keys_file}")
-                with open(keys_file, 'r', encoding='utf-8') as f:
-                    city_configs = json.load(f)
-                    config = city_configs.get(city, {})
-                    if config:
-                        logger.debug(f"Loaded configuration for {city}")
-                        return config
-                    else:
-                        logger.debug(f"No configuration found for city '{city}' in city_scraper.json")
+                logger.debug("Found city config file: %s", keys_file)
+                city_configs = orjson.loads(keys_file.read_bytes())
             else:
-                logger.debug(f"City config file does not exist: {keys_file}")
+                logger.debug("City config file does not exist: %s", keys_file)
         except json.JSONDecodeError as e:
             logger.error(f"Invalid JSON in city_scraper.json: {e}")
             logger.error("Please check the file for syntax errors or invalid characters")
         except Exception as e:
             logger.warning(f"Could not load city config from file: {e}")
         
-        return {}
+        if not isinstance(city_configs, dict):
+            logger.warning(f"Ignoring city_scraper.json: expected a JSON object, got {type(city_configs).__name__}")
+            city_configs = {}
+        
+        _CONFIG_CACHE = city_configs
+        return _CONFIG_CACHE
+    
+    def _load_city_config(self, city: str) -> Dict[str, Any]:
+        """Load city configuration from city_scraper.json file"""
+        config = self._all_configs().get(city, {})
+        if config:
+            logger.debug("Loaded configuration for %s", city)
+        else:
+            logger.debug("No configuration found for city '%s' in city_scraper.json", city)
+        return config
 
     def _load_city_token(self, city: str) -> Optional[str]:
         """Load API token for city from environment or config file"""
@@ -78,7 +218,7 @@ class LegistarScraper:
             logger.info(f"Loaded API token for {city} from environment variable LEGISTAR_{city.upper()}_TOKEN")
             return env_token
         
-        # Then try the config file
+        # Then try the (cached) config file
         config = self._load_city_config(city)
         token = config.get('token')
         if token:
@@ -87,38 +227,40 @@ class LegistarScraper:
         
         return None
     
-    def _add_token_to_params(self, params: Dict[str, Any]) -> Dict[str, Any]:
-        """Add API token to request parameters if available"""
-        if self.api_token:
-            params['token'] = self.api_token
-            logger.debug(f"Added API token to request parameters")
-        else:
-            logger.debug("No API token available - making unauthenticated request")
-        return params
-    
-    def fetch_recent_matters(self, limit: int = 5) -> List[Dict[str, Any]]:
+    def fetch_recent_matters(self, limit: int = 5, skip: int = 0) -> List[Dict[str, Any]]:
         """
         Fetch recent matters from Legistar API
         
         Args:
             limit: Number of matters to fetch (default 5)
+            skip: Number of matters to skip, for paging (default 0)
             
         Returns:
             List of matter dictionaries
+            
+        Raises:
+            ValueError: If the response body is not a JSON list
         """
         url = f"{self.base_url}/matters"
         params = {
             '$top': limit,
-            '$orderby': 'MatterIntroDate desc'
+            '$orderby': 'MatterIntroDate desc,MatterId desc',
+            '$select': self._SELECT_FIELDS,
+            **self._auth_params
         }
-        params = self._add_token_to_params(params)
+        if skip:
+            params['$skip'] = skip
         
         try:
             logger.info(f"Fetching {limit} recent matters from {self.city} Legistar API")
-            response = self.session.get(url, params=params)
+            response = self.session.get(url, params=params, timeout=REQUEST_TIMEOUT)
             response.raise_for_status()
             
-            matters = response.json()
+            matters = orjson.loads(response.content)
+            if not isinstance(matters, list):
+                # Legistar reports some errors as a JSON object with a 200 status
+                logger.error(f"Unexpected response shape: expected a list of matters, got {type(matters).__name__}")
+                raise ValueError(f"Unexpected Legistar response for {self.city}: {matters!r:.200}")
             logger.info(f"Successfully fetched {len(matters)} matters")
             
             return matters
@@ -130,41 +272,58 @@ class LegistarScraper:
             logger.error(f"Error parsing JSON response: {e}")
             raise
     
-    def extract_matter_info(self, matter: Dict[str, Any]) -> Dict[str, Any]:
+    def fetch_recent_matters_paged(self, total: int, page_size: int = MAX_PAGE_SIZE) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Fetch recent matters in pages, downloading pages concurrently
+        
+        Pages are yielded in order, so the caller can process one page
+        while later pages are still in flight. Fetching stops at the first
+        short page; requests for later pages that have not started yet are
+        cancelled, though up to MAX_PAGE_WORKERS may already be in flight.
+        
+        Args:
+            total: Number of matters to fetch
+            page_size: Number of matters per request (default MAX_PAGE_SIZE)
+            
+        Returns:
+            Iterator over lists of matter dictionaries
+        """
+        def fetch_page(skip: int) -> List[Dict[str, Any]]:
+            return self.fetch_recent_matters(min(page_size, total - skip), skip)
+        
+        with ThreadPoolExecutor(max_workers=MAX_PAGE_WORKERS) as executor:
+            futures = [executor.submit(fetch_page, skip) for skip in range(0, total, page_size)]
+            try:
+                for future in futures:
+                    page = future.result()
+                    yield page
+                    if len(page) < page_size:
+                        # The city has no more matters; later pages would be empty
+                        break
+            finally:
+                for future in futures:
+                    future.cancel()
+    
+    def extract_matter_info(self, matter: Dict[str, Any], date_scraped: Optional[str] = None) -> Matter:
         """
         Extract relevant information from a matter record
         
         Args:
             matter: Raw matter dictionary from API
+            date_scraped: ISO timestamp shared by the batch (default: now)
             
         Returns:
             Cleaned matter information
         """
-        return {
-            'id': matter.get('MatterId'),
-            'file_number': matter.get('MatterFile'),
-            'name': matter.get('MatterName'),
-            'title': matter.get('MatterTitle'),
-            'type': matter.get('MatterTypeName'),
-            'status': matter.get('MatterStatusName'),
-            'intro_date': matter.get('MatterIntroDate'),
-            'agenda_date': matter.get('MatterAgendaDate'),
-            'passed_date': matter.get('MatterPassedDate'),
-            'enactment_date': matter.get('MatterEnactmentDate'),
-            'enactment_number': matter.get('MatterEnactmentNumber'),
-            'requester': matter.get('MatterRequester'),
-            'notes': matter.get('MatterNotes'),
-            'version': matter.get('MatterVersion'),
-            'text1': matter.get('MatterText1'),
-            'text2': matter.get('MatterText2'),
-            'text3': matter.get('MatterText3'),
-            'text4': matter.get('MatterText4'),
-            'text5': matter.get('MatterText5'),
-            'date_scraped': datetime.utcnow().isoformat(),
-            'source_url': f"https://webapi.legistar.com/v1/{self.city}/matters/{matter.get('MatterId')}"
-        }
+        matter_id = matter.get('MatterId')
+        # map() runs the per-field lookups in C rather than a bytecode loop
+        return Matter(
+            *map(matter.get, self._FIELD_SOURCES),
+            date_scraped or _utcnow_iso(),
+            self._matter_url_prefix + str(matter_id) if matter_id is not None else None
+        )
     
-    def scrape_and_process(self, limit: int = 5) -> List[Dict[str, Any]]:
+    def scrape_and_process(self, limit: int = 5) -> List[Matter]:
         """
         Main method to scrape and process matters
         
@@ -174,21 +333,28 @@ class LegistarScraper:
         Returns:
             List of processed matter information
         """
-        raw_matters = self.fetch_recent_matters(limit)
+        if limit > MAX_PAGE_SIZE:
+            pages = self.fetch_recent_matters_paged(limit)
+        else:
+            pages = [self.fetch_recent_matters(limit)]
         processed_matters = []
+        # All matters in a batch share one scrape time
+        date_scraped = _utcnow_iso()
         
-        for matter in raw_matters:
-            try:
-                processed_matter = self.extract_matter_info(matter)
-                processed_matters.append(processed_matter)
-                logger.info(f"Processed matter: {processed_matter.get('file_number')} - {processed_matter.get('name')}")
-            except Exception as e:
-                logger.error(f"Error processing matter {matter.get('MatterId', 'unknown')}: {e}")
-                continue
+        for raw_matters in pages:
+            for matter in raw_matters:
+                try:
+                    processed_matter = self.extract_matter_info(matter, date_scraped)
+                    processed_matters.append(processed_matter)
+                    logger.debug("Processed matter: %s - %s", processed_matter.file_number, processed_matter.name)
+                except Exception as e:
+                    logger.error(f"Error processing matter {matter.get('MatterId', 'unknown')}: {e}")
+                    continue
         
+        logger.info("Processed %d matters", len(processed_matters))
         return processed_matters
     
-    def save_to_json(self, matters: List[Dict[str, Any]], filename: str = None) -> str:
+    def save_to_json(self, matters: List[Matter], filename: str = None) -> str:
         """
         Save matters to JSON file
         
@@ -200,7 +366,7 @@ class LegistarScraper:
             Filename of saved file
         """
         # Create results directory if it doesn't exist
-        results_dir = Path(__file__).parent / "results"
+        results_dir = _RESULTS_DIR
         results_dir.mkdir(exist_ok=True)
         
         if filename is None:
@@ -211,8 +377,9 @@ class LegistarScraper:
         if not Path(filename).is_absolute():
             filename = results_dir / filename
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(matters, f, indent=2, ensure_ascii=False, default=str)
+        # orjson emits UTF-8 bytes directly, so skip the text-mode encode pass
+        with open(filename, 'wb') as f:
+            f.write(orjson.dumps(matters, option=orjson.OPT_INDENT_2, default=str))
         
         logger.info(f"Saved {len(matters)} matters to {filename}")
         return str(filename)
@@ -220,10 +387,10 @@ class LegistarScraper:
 def main():
     """Main execution function"""
     parser = argparse.ArgumentParser(description='Scrape Legistar API for legislative matters')
-    parser.add_argument('city', 
-                       help='City code for Legistar API (e.g., "nyc", "chicago", "seattle")')
+    parser.add_argument('cities', nargs='+', metavar='city',
+                       help='One or more city codes for Legistar API (e.g., "nyc", "chicago", "seattle")')
     parser.add_argument('--token', '-t', 
-                       help='API token for Legistar API (can also use LEGISTAR_API_TOKEN env var)')
+                       help='API token for Legistar API, single city only (can also use LEGISTAR_API_TOKEN env var)')
     parser.add_argument('--limit', '-l', type=int, default=5,
                        help='Number of matters to fetch (default: 5)')
     parser.add_argument('--output', '-o',
@@ -231,8 +398,19 @@ def main():
     
     args = parser.parse_args()
     
-    # Get API token from command line argument or environment variable
+    if args.output and len(args.cities) > 1:
+        parser.error("--output can only be used when scraping a single city")
+    if args.token and len(args.cities) > 1:
+        parser.error("--token can only be used when scraping a single city; "
+                     "use LEGISTAR_<CITY>_TOKEN or city_scraper.json for per-city tokens")
+    
+    # Get API token from command line argument or environment variable. A global
+    # token would override every city's own token, so it only applies to one city.
     api_token = args.token or os.getenv('LEGISTAR_API_TOKEN')
+    if api_token and len(args.cities) > 1:
+        logger.warning("Ignoring LEGISTAR_API_TOKEN when scraping multiple cities; "
+                       "using per-city tokens instead")
+        api_token = None
     
     if api_token:
         logger.info("Using API token for authentication")
@@ -240,31 +418,42 @@ def main():
         logger.warning("No API token provided - some endpoints may be limited")
         logger.info("Use --token <token> or set LEGISTAR_API_TOKEN environment variable")
     
-    scraper = LegistarScraper(city=args.city, api_token=api_token)
+    def scrape_city(city: str):
+        scraper = LegistarScraper.for_city(city, api_token)
+        return scraper, scraper.scrape_and_process(limit=args.limit)
     
-    try:
-        # Scrape recent matters
-        matters = scraper.scrape_and_process(limit=args.limit)
-        
-        # Save to JSON file
-        filename = scraper.save_to_json(matters, args.output)
+    # Scrape recent matters for all cities concurrently over the shared session
+    with ThreadPoolExecutor(max_workers=min(len(args.cities), MAX_CONCURRENT_CITIES)) as executor:
+        futures = [(city, executor.submit(scrape_city, city)) for city in args.cities]
+    
+    failed_cities = []
+    for city, future in futures:
+        try:
+            scraper, matters = future.result()
+            
+            # Save to JSON file
+            filename = scraper.save_to_json(matters, args.output)
+        except Exception as e:
+            logger.error(f"Scraping failed for {city}: {e}")
+            failed_cities.append(city)
+            continue
         
         # Print summary
         print(f"\nScraping completed successfully!")
-        print(f"Fetched {len(matters)} matters from {args.city}")
+        print(f"Fetched {len(matters)} matters from {city}")
         print(f"Saved to: {filename}")
         
         # Print brief summary of each matter
-        print(f"\nRecent matters from {args.city}:")
+        print(f"\nRecent matters from {city}:")
         for matter in matters:
-            print(f"- {matter['file_number']}: {matter['name']}")
-            print(f"  Type: {matter['type']}, Status: {matter['status']}")
-            print(f"  Intro Date: {matter['intro_date']}")
+            print(f"- {matter.file_number}: {matter.name}")
+            print(f"  Type: {matter.type}, Status: {matter.status}")
+            print(f"  Intro Date: {matter.intro_date}")
             print()
-            
-    except Exception as e:
-        logger.error(f"Scraping failed: {e}")
-        raise
+    
+    if failed_cities:
+        logger.error(f"Scraping failed for {len(failed_cities)} of {len(args.cities)} cities: {', '.join(failed_cities)}")
+        sys.exit(1)
 
 if __name__ == "__main__":
     main()